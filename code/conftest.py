@@ -0,0 +1,6 @@
+# conftest.py
+# code/ 디렉토리를 기준으로 모듈을 불러오므로 (예: from deduplicator import ...)
+# 저장소 루트에서 pytest를 실행해도 이 디렉토리가 sys.path에 포함되도록 합니다.
+
+# load_test.py는 부하 테스트 도구이며 pytest 테스트가 아닙니다.
+collect_ignore = ["load_test.py"]
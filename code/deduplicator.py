@@ -0,0 +1,294 @@
+# deduplicator.py
+
+import hashlib
+import logging
+import math
+import random
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ChunkDeduplicator:
+    """
+    분할(splitter)과 임베딩 사이에서 중복 청크를 제거하는 클래스.
+    - 페이지마다 반복되는 머리글/바닥글(running header/footer, 페이지 번호 등)을 제거합니다.
+    - 문자 shingle에 대한 MinHash/LSH로 유사도가 threshold 이상인 청크를 제거합니다.
+    - 남은 청크의 metadata에 제거된 청크를 aliases로 기록하고, 절감량을 stats에 기록합니다.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 5,
+        edge_lines: int = 2,
+        boilerplate_ratio: float = 0.5,
+        embedding_dim: int = 1536,
+        false_negative_weight: float = 0.95,
+        seed: int = 1,
+    ) -> None:
+        """
+        :param threshold: 중복으로 판단할 추정 Jaccard 유사도 (0~1)
+        :param num_perm: MinHash 서명 길이 (one-permutation hashing의 bin 수)
+        :param shingle_size: 문자 shingle 길이
+        :param edge_lines: 머리글/바닥글 후보로 볼 페이지 위/아래 줄 수
+        :param boilerplate_ratio: 이 비율 이상의 페이지에 반복되는 줄을 머리글/바닥글로 판단
+        :param embedding_dim: 벡터 크기 절감량 계산에 사용할 임베딩 차원 (OpenAIEmbeddings 기본값 1536)
+        :param false_negative_weight: LSH 밴드 설정 시 false negative(놓친 중복)에 둘 가중치 (0~1)
+        :param seed: shingle 해시와 densification 순서 생성 시드
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold는 0보다 크고 1 이하여야 합니다.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.edge_lines = edge_lines
+        self.boilerplate_ratio = boilerplate_ratio
+        self.embedding_dim = embedding_dim
+
+        self._hash_key = seed.to_bytes(8, "little")
+        # 비어 있는 bin을 채울 때 참조할 bin 순서 (bin마다 고정된 무작위 순서)
+        rng = random.Random(seed)
+        self._probe_orders = []
+        for _ in range(num_perm):
+            order = list(range(num_perm))
+            rng.shuffle(order)
+            self._probe_orders.append(order)
+        self.bands, self.rows = self._recall_weighted_bands(threshold, num_perm, false_negative_weight)
+        self.stats = {}
+        # strip_page_boilerplate 직후 deduplicate가 호출되면 두 호출을 한 번의 수집(run)으로 봅니다.
+        self._stripped = False
+
+    @staticmethod
+    def _recall_weighted_bands(threshold: float, num_perm: int,
+                               false_negative_weight: float) -> Tuple[int, int]:
+        """
+        LSH 후보 확률 곡선 P(s) = 1 - (1 - s^r)^b에 대해
+        (1 - w) * ∫[0, threshold] P(s) ds + w * ∫[threshold, 1] (1 - P(s)) ds가 최소인
+        (밴드 수, 밴드당 행 수)를 선택합니다 (datasketch의 _optimal_param과 같은 방식).
+        후보는 모두 similarity()로 다시 확인하므로 false positive는 비교 한 번의 비용뿐입니다.
+        따라서 w를 크게 두어 threshold 이상인 쌍이 후보에서 빠지지 않도록 곡선을 threshold 아래로 옮깁니다.
+        """
+        def integrate(f, a, b, steps=100):
+            width = (b - a) / steps
+            return sum(f(a + (i + 0.5) * width) for i in range(steps)) * width
+
+        best = (num_perm, 1)
+        best_error = float("inf")
+        for bands in range(1, num_perm + 1):
+            for rows in range(1, num_perm // bands + 1):
+                false_positive = integrate(lambda s: 1 - (1 - s ** rows) ** bands, 0.0, threshold)
+                false_negative = integrate(lambda s: (1 - s ** rows) ** bands, threshold, 1.0)
+                error = (1 - false_negative_weight) * false_positive + false_negative_weight * false_negative
+                if error < best_error:
+                    best, best_error = (bands, rows), error
+        return best
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    @staticmethod
+    def _boilerplate_key(line: str, page_index: int) -> str:
+        """
+        머리글/바닥글 비교용 키. 페이지 번호로 보이는 숫자 토큰 하나만 (숫자 - 페이지 순서) 값으로 바꾸고
+        나머지는 그대로 비교합니다. 따라서 숫자가 페이지마다 1씩 함께 증가할 때만 같은 줄로 봅니다.
+        - 숫자만 있는 줄: "3", "- 3 -", "[3]"
+        - "page N" 형태: "Page 3 of 20" ("of 20"은 그대로 비교)
+        - 짧은 줄(단어 6개 이하)의 앞/뒤 숫자 토큰: "12 Journal of AI", "Search-o1 Preprint 12"
+        "Table 3: ...", "Figure 2" / "Figure 5", "Results 2023"처럼 숫자가 페이지와 함께 증가하지 않는 줄은
+        서로 다른 줄로 봅니다 (내용이 완전히 같은 줄은 그대로 반복되는 줄로 봅니다).
+        :param line: 페이지의 한 줄
+        :param page_index: 0부터 시작하는 페이지 순서
+        """
+        key = ChunkDeduplicator._normalize(line)
+
+        def offset(match):
+            return f"{match.group(1)}#{int(match.group(2)) - page_index}{match.group(3)}"
+
+        patterns = [r"^(\W*)(\d+)(\W*)$", r"(\bpage )(\d+)(\b)"]
+        if len(key.split()) <= 6:
+            patterns += [r"^()(\d+)(\s)", r"(\s)(\d+)()$"]
+        for pattern in patterns:
+            key, replaced = re.subn(pattern, offset, key, count=1)
+            if replaced:
+                break
+        return key
+
+    def strip_page_boilerplate(self, pages: List[str]) -> List[str]:
+        """
+        여러 페이지의 위/아래 edge_lines 줄에 반복되는 머리글/바닥글을 제거합니다.
+        :param pages: 페이지별 텍스트 리스트 (SecureFileLoader.load_pdf_pages의 반환값)
+        :return: 머리글/바닥글이 제거된 페이지별 텍스트 리스트
+        """
+        # 새 수집을 시작하므로 이전 호출의 통계를 지웁니다.
+        self.stats = {"boilerplate_lines_removed": 0, "boilerplate_chars_removed": 0}
+        self._stripped = True
+        min_pages = max(2, math.ceil(len(pages) * self.boilerplate_ratio))
+        if len(pages) < 3:
+            return list(pages)
+
+        page_lines = [page.splitlines() for page in pages]
+        counts = Counter()
+        for page_index, lines in enumerate(page_lines):
+            counts.update({
+                self._boilerplate_key(line, page_index) for line in self._edge_lines(lines) if line.strip()
+            })
+        boilerplate = {key for key, count in counts.items() if count >= min_pages}
+
+        removed = 0
+        removed_chars = 0
+        cleaned_pages = []
+        for page_index, lines in enumerate(page_lines):
+            edge = set(self._edge_indices(len(lines)))
+            kept = []
+            for i, line in enumerate(lines):
+                if i in edge and line.strip() and self._boilerplate_key(line, page_index) in boilerplate:
+                    removed += 1
+                    removed_chars += len(line)
+                    continue
+                kept.append(line)
+            cleaned_pages.append("\n".join(kept))
+
+        self.stats["boilerplate_lines_removed"] = removed
+        self.stats["boilerplate_chars_removed"] = removed_chars
+        logger.info(f"반복되는 머리글/바닥글 {removed}줄({removed_chars}자)을 제거했습니다.")
+        return cleaned_pages
+
+    def _edge_indices(self, num_lines: int) -> List[int]:
+        # 머리글/바닥글 영역보다 짧은 페이지는 본문까지 지워질 수 있으므로 제외합니다.
+        if num_lines <= 2 * self.edge_lines:
+            return []
+        top = range(min(self.edge_lines, num_lines))
+        bottom = range(max(0, num_lines - self.edge_lines), num_lines)
+        return sorted(set(top) | set(bottom))
+
+    def _edge_lines(self, lines: List[str]) -> List[str]:
+        return [lines[i] for i in self._edge_indices(len(lines))]
+
+    def _shingles(self, text: str) -> set:
+        normalized = self._normalize(text)
+        if len(normalized) <= self.shingle_size:
+            return {normalized}
+        return {normalized[i:i + self.shingle_size] for i in range(len(normalized) - self.shingle_size + 1)}
+
+    def minhash(self, text: str) -> List[int]:
+        """
+        텍스트의 MinHash 서명을 one-permutation hashing으로 계산합니다.
+        shingle마다 해시를 한 번만 계산하고, 해시 값으로 정한 bin에 최솟값을 남깁니다.
+        비어 있는 bin은 bin마다 고정된 순서로 다른 bin의 값을 빌려 채웁니다 (optimal densification).
+        num_perm개의 순열을 모두 계산하는 방식과 같은 방식으로 Jaccard 유사도를 추정합니다.
+        :param text: 청크 텍스트
+        :return: 길이 num_perm의 MinHash 서명
+        """
+        bins = [None] * self.num_perm
+        for shingle in self._shingles(text):
+            h = int.from_bytes(
+                hashlib.blake2b(shingle.encode("utf-8"), digest_size=8, key=self._hash_key).digest(), "little"
+            )
+            index, value = h % self.num_perm, h // self.num_perm
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+
+        signature = list(bins)
+        for index, value in enumerate(bins):
+            if value is None:
+                donor = next(j for j in self._probe_orders[index] if bins[j] is not None)
+                signature[index] = bins[donor]
+        return signature
+
+    @staticmethod
+    def similarity(signature_a: List[int], signature_b: List[int]) -> float:
+        """
+        두 MinHash 서명으로 추정한 Jaccard 유사도
+        """
+        matches = sum(1 for x, y in zip(signature_a, signature_b) if x == y)
+        return matches / len(signature_a)
+
+    def deduplicate(self, chunks: List[str]) -> Tuple[List[str], List[Dict]]:
+        """
+        유사도가 threshold 이상인 청크를 제거합니다.
+        먼저 나온 청크를 남기고, 이후의 유사 청크는 남은 청크의 aliases로 기록합니다.
+        분할 결과 리스트는 저장되지 않으므로 alias에는 제거된 청크의 텍스트를 그대로 기록합니다.
+        (텍스트는 docstore의 metadata에만 남고 벡터와 임베딩 호출은 절감됩니다.)
+        :param chunks: 분할된 텍스트 청크 리스트
+        :return: (남은 청크 리스트, 청크별 metadata 리스트)
+                 metadata는 {"aliases": [{"text", "similarity"}, ...]}
+                 형태이며 FAISS.from_texts의 metadatas로 그대로 전달할 수 있습니다.
+        stats는 직전에 호출한 strip_page_boilerplate의 결과와 이번 호출의 결과만 담습니다.
+        """
+        if not self._stripped:
+            self.stats = {"boilerplate_lines_removed": 0, "boilerplate_chars_removed": 0}
+        self._stripped = False
+
+        buckets = defaultdict(list)
+        signatures = {}
+        retained = []
+        metadatas = []
+        position = {}
+        empty = 0
+
+        for chunk_id, chunk in enumerate(chunks):
+            if not chunk.strip():
+                empty += 1
+                continue
+
+            signature = self.minhash(chunk)
+            band_keys = [
+                (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)
+            ]
+
+            candidates = {candidate for key in band_keys for candidate in buckets[key]}
+            best_id, best_similarity = None, 0.0
+            for candidate in candidates:
+                score = self.similarity(signature, signatures[candidate])
+                if score > best_similarity:
+                    best_id, best_similarity = candidate, score
+
+            if best_id is not None and best_similarity >= self.threshold:
+                metadatas[position[best_id]]["aliases"].append(
+                    {"text": chunk, "similarity": round(best_similarity, 4)}
+                )
+                continue
+
+            signatures[chunk_id] = signature
+            for key in band_keys:
+                buckets[key].append(chunk_id)
+            position[chunk_id] = len(retained)
+            retained.append(chunk)
+            metadatas.append({"aliases": []})
+
+        self._update_stats(chunks, retained, empty)
+        logger.info(
+            f"청크 {len(chunks)}개 중 {len(chunks) - len(retained)}개를 중복으로 제거했습니다. "
+            f"(임베딩 문자 {self.stats['embedding_chars_saved']}자, 벡터 {self.stats['vector_bytes_saved']}바이트 절감)"
+        )
+        return retained, metadatas
+
+    def _update_stats(self, chunks: List[str], retained: List[str], empty: int) -> None:
+        input_chars = sum(len(chunk) for chunk in chunks)
+        retained_chars = sum(len(chunk) for chunk in retained)
+        dropped = len(chunks) - len(retained)
+        # strip_page_boilerplate에서 제거한 문자도 임베딩되지 않으므로 절감량에 포함합니다.
+        chars_saved = input_chars - retained_chars + self.stats.get("boilerplate_chars_removed", 0)
+        self.stats.update({
+            "input_chunks": len(chunks),
+            "retained_chunks": len(retained),
+            "dropped_chunks": dropped,
+            "empty_chunks": empty,
+            "dropped_ratio": dropped / len(chunks) if chunks else 0.0,
+            "input_chars": input_chars,
+            "retained_chars": retained_chars,
+            "duplicate_chars_removed": input_chars - retained_chars,
+            "embedding_chars_saved": chars_saved,
+            # 영어 기준 약 4자당 1토큰으로 추정한 임베딩 토큰 절감량
+            "estimated_embedding_tokens_saved": chars_saved // 4,
+            # 제거된 청크의 float32 벡터 크기만 계산합니다.
+            # 제거된 청크의 텍스트는 aliases로 docstore에 남으므로 docstore 크기는 줄지 않습니다.
+            "vector_bytes_saved": dropped * self.embedding_dim * 4,
+        })
@@ -0,0 +1,390 @@
+# load_test.py
+"""
+질문 → 답변 경로(질문 임베딩 → FAISS 검색 → QnAService.get_answer)에 대한 부하 테스트 도구.
+
+- data/QnA.yaml의 질문 또는 논문 단락에서 만든 합성 질문을 반복 재생합니다.
+- closed-loop(동시 사용자 수 고정) 또는 open-loop(목표 QPS 고정) 방식으로 부하를 발생시킵니다.
+- 지연 시간과 토큰 생성 속도를 설정할 수 있는 로컬 스텁 LLM을 사용하므로 OpenAI 비용이 들지 않습니다.
+- 처리량, 단계별 p50/p95/p99, 큐 대기 시간, 오류율을 보고합니다.
+
+사용 예:
+    python load_test.py --mode closed --concurrency 8 --requests 200
+    python load_test.py --mode open --qps 20 --workers 4 --questions synthetic --output report.json
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from loaders.secure_file_loader import SecureFileLoader
+from services.ask_service import AskService
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+STAGES = ["queue", "embed", "search", "llm", "total"]
+PERCENTILES = [50, 95, 99]
+
+
+class StubLLMService:
+    """
+    QnAService와 같은 인터페이스(context로 생성, get_answer 호출)를 가진 로컬 스텁 LLM.
+    - 첫 토큰까지의 지연(ttft)과 초당 토큰 생성 속도(token_rate)만큼 대기한 뒤 답변을 반환합니다.
+    - error_rate 확률로 예외를 발생시켜 오류 처리 경로도 확인할 수 있습니다.
+    """
+
+    def __init__(self, context, ttft: float = 0.2, token_rate: float = 50.0,
+                 output_tokens: int = 100, error_rate: float = 0.0) -> None:
+        """
+        :param context: 검색된 단락을 결합한 문자열
+        :param ttft: 첫 토큰까지의 지연(초)
+        :param token_rate: 초당 생성 토큰 수
+        :param output_tokens: 답변 토큰 수
+        :param error_rate: 예외 발생 확률(0~1)
+        """
+        self.context = context
+        self.ttft = ttft
+        self.token_rate = token_rate
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+
+    def get_answer(self, question):
+        delay = self.ttft
+        if self.token_rate > 0:
+            delay += self.output_tokens / self.token_rate
+        time.sleep(delay)
+        if random.random() < self.error_rate:
+            raise RuntimeError("스텁 LLM 오류")
+        return " ".join(["token"] * self.output_tokens)
+
+
+def make_stub_llm(ttft: float, token_rate: float, output_tokens: int, error_rate: float):
+    """
+    AskService의 qna_service_cls로 전달할 스텁 LLM 생성 함수를 만듭니다.
+    :return: context를 받아 StubLLMService를 반환하는 함수
+    """
+    def factory(context):
+        return StubLLMService(context, ttft, token_rate, output_tokens, error_rate)
+    return factory
+
+
+def load_qna_questions(loader: SecureFileLoader, filename: str = "QnA.yaml") -> list:
+    """
+    QnA.yaml에서 질문 목록을 불러옵니다.
+    :param loader: SecureFileLoader 인스턴스
+    :param filename: 질문 YAML 파일명
+    :return: 질문 문자열 리스트
+    """
+    qna_data = loader.load_yaml(filename) or {}
+    questions = [item.get("question", "") for item in qna_data.get("questions", [])]
+    return [q for q in questions if q]
+
+
+def synthesize_questions(paragraphs: list, count: int, seed: int = 0) -> list:
+    """
+    논문 단락에서 합성 질문을 생성합니다.
+    단락 앞부분의 단어를 이용하므로 검색 결과가 실제 인덱스 내용과 연관됩니다.
+    :param paragraphs: 인덱스에 저장된 단락 리스트
+    :param count: 생성할 질문 수
+    :param seed: 난수 시드
+    :return: 질문 문자열 리스트
+    """
+    rng = random.Random(seed)
+    templates = [
+        "{}에 대해 설명해 주세요.",
+        "논문에서 {}의 의미는 무엇입니까?",
+        "{}와 관련된 결과를 요약해 주세요.",
+    ]
+    candidates = [p for p in paragraphs if p.split()]
+    if not candidates:
+        return []
+    questions = []
+    for _ in range(count):
+        words = rng.choice(candidates).split()
+        start = rng.randrange(max(1, len(words) - 5))
+        phrase = " ".join(words[start:start + 6])
+        questions.append(rng.choice(templates).format(phrase))
+    return questions
+
+
+def build_index(loader: SecureFileLoader, pdf_filename: str, model, deduplicate: bool = False):
+    """
+    PDF를 분할하고 임베딩하여 FAISS 인덱스를 생성합니다.
+    :param loader: SecureFileLoader 인스턴스
+    :param pdf_filename: 논문 PDF 파일명
+    :param model: encode 메서드를 가진 임베딩 모델
+    :param deduplicate: True이면 머리글/바닥글과 중복 청크를 제거한 뒤 임베딩.
+                        main.py가 사용하는 인덱스는 중복 제거를 하지 않으므로 기본값은 False입니다.
+    :return: (단락 리스트, FAISS 인덱스, 중복 제거 통계 dict (deduplicate=False이면 빈 dict))
+    """
+    import faiss
+    from deduplicator import ChunkDeduplicator
+    from splitter import TextSplitter
+
+    pages = loader.load_pdf_pages(pdf_filename)
+    dedup_stats = {}
+    if deduplicate:
+        deduplicator = ChunkDeduplicator(embedding_dim=model.get_sentence_embedding_dimension())
+        pages = deduplicator.strip_page_boilerplate(pages)
+    paragraphs = TextSplitter().recursive_character_text_splitter("\n".join(pages))
+    if deduplicate:
+        # 원시 FAISS 인덱스에는 metadata 저장소가 없고 검색에도 필요 없으므로 aliases는 사용하지 않습니다.
+        paragraphs, _ = deduplicator.deduplicate(paragraphs)
+        dedup_stats = deduplicator.stats
+    embeddings = model.encode(paragraphs)
+    index = faiss.IndexFlatL2(embeddings.shape[1])
+    index.add(embeddings)
+    logger.info(f"{len(paragraphs)}개 단락으로 FAISS 인덱스를 생성했습니다.")
+    return paragraphs, index, dedup_stats
+
+
+def _timed_request(ask_service: AskService, question: str, scheduled_at: float) -> dict:
+    """
+    요청 하나를 실행하고 단계별 소요 시간(초)을 기록합니다.
+    queue는 요청이 예정된 시각부터 워커가 실행을 시작한 시각까지의 대기 시간입니다.
+    """
+    started = perf_counter()
+    record = {"queue": started - scheduled_at, "error": None}
+    timings = {}
+    try:
+        ask_service.ask(question, timings)
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    record.update(timings)
+    record["total"] = perf_counter() - scheduled_at
+    return record
+
+
+def run_closed_loop(ask_service: AskService, questions: list, num_requests: int,
+                    concurrency: int, workers: int) -> tuple:
+    """
+    concurrency명의 가상 사용자가 각각 이전 응답을 받은 직후 다음 질문을 보내는 closed-loop 부하.
+    workers가 concurrency보다 작으면 요청은 워커 풀 앞에서 대기하며 이 시간이 queue로 측정됩니다.
+    :return: (요청 기록 리스트, 전체 소요 시간(초))
+    """
+    counter = itertools.count()
+    results = []
+    lock = threading.Lock()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        def client():
+            while True:
+                i = next(counter)
+                if i >= num_requests:
+                    return
+                question = questions[i % len(questions)]
+                record = executor.submit(_timed_request, ask_service, question, perf_counter()).result()
+                with lock:
+                    results.append(record)
+
+        start = perf_counter()
+        clients = [threading.Thread(target=client) for _ in range(concurrency)]
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = perf_counter() - start
+
+    return results, elapsed
+
+
+def run_open_loop(ask_service: AskService, questions: list, num_requests: int,
+                  qps: float, workers: int, poisson: bool = False, seed: int = 0) -> tuple:
+    """
+    응답과 무관하게 목표 QPS로 요청을 보내는 open-loop 부하.
+    처리 용량을 넘어서면 queue 대기 시간이 계속 증가합니다.
+    :param poisson: True이면 도착 간격을 지수 분포로, False이면 균일 간격으로 생성
+    :return: (요청 기록 리스트, 전체 소요 시간(초))
+    """
+    rng = random.Random(seed)
+    futures = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = perf_counter()
+        scheduled_at = start
+        for i in range(num_requests):
+            delay = scheduled_at - perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            question = questions[i % len(questions)]
+            futures.append(executor.submit(_timed_request, ask_service, question, scheduled_at))
+            scheduled_at += rng.expovariate(qps) if poisson else 1.0 / qps
+        results = [future.result() for future in futures]
+        elapsed = perf_counter() - start
+
+    return results, elapsed
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    nearest-rank 방식의 백분위수
+    :param sorted_values: 오름차순 정렬된 값 리스트
+    :param pct: 백분위(0~100)
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _stage_stats(records: list) -> dict:
+    """
+    요청 기록의 단계별 지연 시간 통계(밀리초)를 계산합니다.
+    """
+    stages = {}
+    for stage in STAGES:
+        values = sorted(r[stage] * 1000 for r in records if stage in r)
+        if not values:
+            continue
+        stats = {f"p{p}": percentile(values, p) for p in PERCENTILES}
+        stats["mean"] = sum(values) / len(values)
+        stats["max"] = values[-1]
+        stats["count"] = len(values)
+        stages[stage] = stats
+    return stages
+
+
+def summarize(results: list, elapsed: float) -> dict:
+    """
+    요청 기록을 보고서로 요약합니다. 시간 단위는 밀리초입니다.
+    빠르게 실패한 요청이 지연 시간을 낮춰 보이게 하지 않도록 stages_ms는 성공한 요청만으로 계산하고,
+    실패한 요청의 지연 시간은 error_stages_ms에 따로 기록합니다.
+    :param results: _timed_request의 반환값 리스트
+    :param elapsed: 전체 소요 시간(초)
+    :return: 보고서 dict
+    """
+    errors = [r for r in results if r["error"]]
+    successes = [r for r in results if not r["error"]]
+    return {
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(successes) / elapsed if elapsed > 0 else 0.0,
+        "stages_ms": _stage_stats(successes),
+        "error_stages_ms": _stage_stats(errors),
+        "sample_errors": sorted({r["error"] for r in errors})[:5],
+    }
+
+
+def _print_stage_table(stages: dict) -> None:
+    columns = ["p50", "p95", "p99", "mean", "max"]
+    print(f"{'stage':<8}" + "".join(f"{name:>10}" for name in columns))
+    for stage, stats in stages.items():
+        print(f"{stage:<8}" + "".join(f"{stats[name]:>10.1f}" for name in columns))
+
+
+def print_report(report: dict) -> None:
+    print(f"요청 수: {report['requests']}  오류: {report['errors']} ({report['error_rate']:.2%})")
+    print(f"소요 시간: {report['elapsed_s']:.2f}s  처리량: {report['throughput_rps']:.2f} req/s")
+    print("[성공한 요청]")
+    _print_stage_table(report["stages_ms"])
+    if report["error_stages_ms"]:
+        print("[실패한 요청]")
+        _print_stage_table(report["error_stages_ms"])
+    for error in report["sample_errors"]:
+        print(f"[ERROR] {error}")
+    dedup = report.get("dedup")
+    if dedup:
+        print(
+            f"중복 제거: 청크 {dedup['input_chunks']}개 중 {dedup['dropped_chunks']}개 제거, "
+            f"머리글/바닥글 {dedup['boilerplate_lines_removed']}줄 제거, "
+            f"임베딩 {dedup['embedding_chars_saved']}자(약 {dedup['estimated_embedding_tokens_saved']}토큰), "
+            f"벡터 {dedup['vector_bytes_saved']}바이트 절감"
+        )
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="질문 → 답변 경로 부하 테스트")
+    parser.add_argument("--data-dir", default="data", help="QnA.yaml과 논문 PDF가 있는 디렉토리")
+    parser.add_argument("--pdf", default="Search-o1 Agentic Search-Enhanced.pdf", help="인덱싱할 논문 PDF 파일명")
+    parser.add_argument("--questions", choices=["qna", "synthetic", "both"], default="qna",
+                        help="qna: QnA.yaml, synthetic: 단락 기반 합성 질문, both: 둘 다")
+    parser.add_argument("--synthetic-count", type=int, default=100, help="합성 질문 수")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed",
+                        help="closed: 동시 사용자 수 고정, open: 목표 QPS 고정")
+    parser.add_argument("--concurrency", type=int, default=4, help="closed-loop 동시 사용자 수")
+    parser.add_argument("--qps", type=float, default=5.0, help="open-loop 목표 QPS")
+    parser.add_argument("--poisson", action="store_true", help="open-loop 도착 간격을 지수 분포로 생성")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="요청을 처리하는 워커 스레드 수 (기본값: closed는 concurrency, open은 16)")
+    parser.add_argument("--requests", type=int, default=100, help="총 요청 수")
+    parser.add_argument("--top-k", type=int, default=5, help="검색할 단락 수")
+    parser.add_argument("--dedup", action="store_true",
+                        help="인덱스 생성 시 중복 청크 제거를 적용 (기본값: 배포 경로와 같이 적용하지 않음)")
+    parser.add_argument("--embedding-model", default="all-MiniLM-L6-v2", help="SentenceTransformer 모델명")
+    parser.add_argument("--llm", choices=["stub", "openai"], default="stub", help="답변 생성에 사용할 LLM")
+    parser.add_argument("--llm-ttft", type=float, default=0.2, help="스텁 LLM 첫 토큰 지연(초)")
+    parser.add_argument("--llm-token-rate", type=float, default=50.0, help="스텁 LLM 초당 토큰 수")
+    parser.add_argument("--llm-output-tokens", type=int, default=100, help="스텁 LLM 답변 토큰 수")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="스텁 LLM 오류 발생 확률")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    parser.add_argument("--output", default=None, help="보고서를 저장할 JSON 파일 경로")
+    args = parser.parse_args(argv)
+
+    for name in ["qps", "concurrency", "requests"]:
+        if getattr(args, name) <= 0:
+            parser.error(f"--{name} 값은 0보다 커야 합니다.")
+    if args.workers is not None and args.workers <= 0:
+        parser.error("--workers 값은 0보다 커야 합니다.")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+
+    from sentence_transformers import SentenceTransformer
+
+    loader = SecureFileLoader(base_dir=args.data_dir)
+    model = SentenceTransformer(args.embedding_model)
+    paragraphs, index, dedup_stats = build_index(loader, args.pdf, model, deduplicate=args.dedup)
+
+    questions = []
+    if args.questions in ("qna", "both"):
+        questions += load_qna_questions(loader)
+    if args.questions in ("synthetic", "both"):
+        questions += synthesize_questions(paragraphs, args.synthetic_count, args.seed)
+    if not questions:
+        raise ValueError("재생할 질문이 없습니다.")
+
+    if args.llm == "stub":
+        qna_service_cls = make_stub_llm(
+            args.llm_ttft, args.llm_token_rate, args.llm_output_tokens, args.llm_error_rate
+        )
+    else:
+        from services.qna_service import QnAService
+        qna_service_cls = QnAService
+
+    ask_service = AskService(model, index, paragraphs, qna_service_cls=qna_service_cls, top_k=args.top_k)
+
+    logger.info(f"{args.mode}-loop 부하 테스트 시작: 질문 {len(questions)}개, 요청 {args.requests}개")
+    if args.mode == "closed":
+        workers = args.workers or args.concurrency
+        results, elapsed = run_closed_loop(ask_service, questions, args.requests, args.concurrency, workers)
+    else:
+        workers = args.workers or 16
+        results, elapsed = run_open_loop(
+            ask_service, questions, args.requests, args.qps, workers, args.poisson, args.seed
+        )
+
+    report = summarize(results, elapsed)
+    report["dedup"] = dedup_stats
+    report["config"] = vars(args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"보고서가 '{args.output}' 파일에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
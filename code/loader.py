@@ -1,7 +1,7 @@
 import os
 import yaml
 import pdfplumber
-from typing import Dict
+from typing import Dict, List
 import logging
 from dotenv import load_dotenv
 
@@ -94,11 +94,12 @@ class SecureFileLoader:
             raise FileLoaderError(f"알 수 없는 오류: {e}")
         return data
 
-    def load_pdf(self, filename: str) -> str:
+    def load_pdf_pages(self, filename: str) -> List[str]:
         """
-        PDF 파일 텍스트 로드 함수.
+        PDF 파일 텍스트를 페이지 단위로 로드하는 함수.
+        반복되는 머리글/바닥글 제거처럼 페이지 경계가 필요한 전처리에 사용합니다.
         :param filename: 불러올 PDF 파일명
-        :return: PDF 전체 페이지의 텍스트를 합쳐서 반환한 문자열
+        :return: 텍스트가 있는 페이지들의 텍스트 리스트
         """
         path = self._validate_and_construct_path(filename)
         all_text = []
@@ -115,7 +116,15 @@ class SecureFileLoader:
         except Exception as e:
             logger.error(f"PDF 처리 중 오류: {e}")
             raise PdfProcessingError(f"PDF 처리 중 오류: {e}")
-        return "\n".join(all_text)
+        return all_text
+
+    def load_pdf(self, filename: str) -> str:
+        """
+        PDF 파일 텍스트 로드 함수.
+        :param filename: 불러올 PDF 파일명
+        :return: PDF 전체 페이지의 텍스트를 합쳐서 반환한 문자열
+        """
+        return "\n".join(self.load_pdf_pages(filename))
 
 if __name__ == "__main__":
     loader = SecureFileLoader(base_dir="data")
@@ -3,7 +3,7 @@
 import os
 import yaml
 import pdfplumber
-from typing import Dict
+from typing import Dict, List
 import logging
 from exceptions.file_loader_exceptions import (
     FileLoaderError,
@@ -58,7 +58,7 @@ class SecureFileLoader:
             raise FileLoaderError(f"알 수 없는 오류: {e}")
         return data
 
-    def load_pdf(self, filename: str) -> str:
+    def load_pdf_pages(self, filename: str) -> List[str]:
         path = self._validate_and_construct_path(filename)
         all_text = []
         try:
@@ -74,7 +74,10 @@ class SecureFileLoader:
         except Exception as e:
             logger.error(f"PDF 처리 중 오류: {e}")
             raise PdfProcessingError(f"PDF 처리 중 오류: {e}")
-        return "\n".join(all_text)
+        return all_text
+
+    def load_pdf(self, filename: str) -> str:
+        return "\n".join(self.load_pdf_pages(filename))
 
 if __name__ == "__main__":
     loader = SecureFileLoader(base_dir="data")
@@ -5,7 +5,7 @@ import logging
 from dotenv import load_dotenv
 from preprocess import load_index
 from services.qna_service import QnAService
-from utils.helper_functions import preprocess_text
+from services.ask_service import AskService
 from sentence_transformers import SentenceTransformer
 import faiss
 import pickle
@@ -106,24 +106,16 @@ def main():
             return
 
         try:
-            # 질문 임베딩 생성
+            # 질문 임베딩 → 유사한 상위 5개 단락 검색 → 답변 생성
             model = SentenceTransformer('all-MiniLM-L6-v2')
-            question_embedding = model.encode([question])
-
-            # FAISS 인덱스 로드
-            index = st.session_state.index
-            paragraphs = st.session_state.paragraphs
-
-            # 유사한 상위 5개 단락 검색
-            D, I = index.search(question_embedding, 5)
-            relevant_paragraphs = [paragraphs[i] for i in I[0]]
-
-            # 관련 단락 결합
-            context = "\n".join(relevant_paragraphs)
-
-            # QnA 서비스 초기화
-            qna_service = QnAService(context)
-            answer = qna_service.get_answer(preprocess_text(question))
+            ask_service = AskService(
+                model,
+                st.session_state.index,
+                st.session_state.paragraphs,
+                qna_service_cls=QnAService,
+                top_k=5,
+            )
+            answer = ask_service.ask(question)
 
             # 사용자 질문 및 답변 추가
             st.session_state.messages.append({"type": "user", "content": question})
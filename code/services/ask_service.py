@@ -0,0 +1,83 @@
+# services/ask_service.py
+
+import logging
+from time import perf_counter
+from services.qna_service import QnAService
+from utils.helper_functions import preprocess_text
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class AskService:
+    """
+    질문 → 답변 경로(질문 임베딩 → FAISS 검색 → QnAService.get_answer)를 단계별로 묶은 서비스.
+    - main.py의 handle_question과 load_test.py가 같은 경로를 사용하도록 분리했습니다.
+    - 각 단계는 개별 메서드로 노출되어 단계별 지연 시간을 측정할 수 있습니다.
+    """
+
+    def __init__(self, model, index, paragraphs: list, qna_service_cls=QnAService, top_k: int = 5) -> None:
+        """
+        :param model: encode 메서드를 가진 임베딩 모델 (예: SentenceTransformer)
+        :param index: FAISS 인덱스
+        :param paragraphs: 인덱스에 저장된 순서대로의 단락 리스트
+        :param qna_service_cls: context를 받아 생성되고 get_answer를 제공하는 QnA 서비스 클래스
+        :param top_k: 검색할 단락 수
+        """
+        self.model = model
+        self.index = index
+        self.paragraphs = paragraphs
+        self.qna_service_cls = qna_service_cls
+        self.top_k = top_k
+
+    def embed(self, question: str):
+        """
+        질문 임베딩 생성
+        :param question: 사용자 질문
+        :return: (1, dim) 형태의 질문 임베딩
+        """
+        return self.model.encode([question])
+
+    def search(self, question_embedding) -> str:
+        """
+        유사한 상위 top_k개 단락을 검색하여 하나의 context로 결합합니다.
+        :param question_embedding: embed()의 반환값
+        :return: 관련 단락을 결합한 문자열
+        """
+        D, I = self.index.search(question_embedding, self.top_k)
+        relevant_paragraphs = [self.paragraphs[i] for i in I[0] if i >= 0]
+        return "\n".join(relevant_paragraphs)
+
+    def answer(self, context: str, question: str) -> str:
+        """
+        QnA 서비스로 답변을 생성합니다.
+        :param context: search()의 반환값
+        :param question: 사용자 질문
+        :return: 생성된 답변
+        """
+        qna_service = self.qna_service_cls(context)
+        return qna_service.get_answer(preprocess_text(question))
+
+    def ask(self, question: str, timings: dict = None) -> str:
+        """
+        전체 경로를 실행합니다.
+        :param question: 사용자 질문
+        :param timings: 전달되면 단계별 소요 시간(초)을 'embed', 'search', 'llm' 키로 기록
+        :return: 생성된 답변
+        """
+        if timings is None:
+            timings = {}
+
+        start = perf_counter()
+        question_embedding = self.embed(question)
+        timings["embed"] = perf_counter() - start
+
+        start = perf_counter()
+        context = self.search(question_embedding)
+        timings["search"] = perf_counter() - start
+
+        start = perf_counter()
+        answer = self.answer(context, question)
+        timings["llm"] = perf_counter() - start
+
+        return answer
@@ -6,15 +6,22 @@ from langchain_experimental.text_splitter import SemanticChunker
 from langchain_openai.embeddings import OpenAIEmbeddings
 from langchain.vectorstores import FAISS
 from splitter import TextSplitter
+from deduplicator import ChunkDeduplicator
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SearchService:
-    def __init__(self, data: str):
+    def __init__(self, data, deduplicator: ChunkDeduplicator = None):
+        """
+        :param data: 논문 텍스트(문자열) 또는 페이지별 텍스트 리스트(SecureFileLoader.load_pdf_pages의 반환값).
+                     페이지 리스트를 전달하면 반복되는 머리글/바닥글을 제거한 뒤 분할합니다.
+        :param deduplicator: 분할과 임베딩 사이에서 중복 청크를 제거할 ChunkDeduplicator (기본값: 기본 설정)
+        """
         self.data = data
         self.splitter = TextSplitter()
+        self.deduplicator = deduplicator or ChunkDeduplicator()
         self.embeddings = OpenAIEmbeddings()
         self.vector_store = self.initialize_vector_store()
 
@@ -27,12 +34,20 @@ class SearchService:
         :return: FAISS 벡터 스토어 객체
         """
         try:
+            # 페이지별 머리글/바닥글 제거
+            text = self.data
+            if isinstance(text, list):
+                text = "\n".join(self.deduplicator.strip_page_boilerplate(text))
+
             # 텍스트 분할
-            text_chunks = self.splitter.semantic_chunker(self.data)
+            text_chunks = self.splitter.semantic_chunker(text)
             logger.info(f"텍스트를 {len(text_chunks)}개의 청크로 분할했습니다.")
-            
+
+            # 중복 청크 제거 (제거된 청크는 남은 청크의 metadata에 aliases로 기록)
+            text_chunks, metadatas = self.deduplicator.deduplicate(text_chunks)
+
             # FAISS 벡터 스토어 초기화
-            vector_store = FAISS.from_texts(text_chunks, self.embeddings)
+            vector_store = FAISS.from_texts(text_chunks, self.embeddings, metadatas=metadatas)
             logger.info("FAISS 벡터 스토어를 초기화했습니다.")
             
             return vector_store
@@ -0,0 +1,101 @@
+# tests/test_deduplicator.py
+
+from deduplicator import ChunkDeduplicator
+
+
+BASE_CHUNK = (
+    "Search-o1 integrates an agentic retrieval-augmented generation mechanism into large reasoning models "
+    "so that they can fetch external knowledge when they encounter uncertain steps."
+)
+
+
+def make_pages(num_pages=8):
+    pages = []
+    for i in range(num_pages):
+        pages.append("\n".join([
+            "Search-o1: Agentic Search-Enhanced Large Reasoning Models",
+            f"Table {i * 3}: accuracy on benchmarks",
+            f"body line {'x' * (i + 1)}",
+            f"second body line {'y' * (i + 1)}",
+            f"Figure {i * 2 + 5}",
+            f"- {i + 1} -",
+        ]))
+    return pages
+
+
+def test_boilerplate_key_matches_page_numbers():
+    key = ChunkDeduplicator._boilerplate_key
+    assert key("3", 2) == key("4", 3)
+    assert key("- 3 -", 2) == key("- 4 -", 3)
+    assert key("Page 3 of 20", 2) == key("Page 4 of 20", 3)
+    assert key("Search-o1 Preprint 12", 11) == key("Search-o1 Preprint 13", 12)
+    assert key("12 Journal of AI", 11) == key("13 Journal of AI", 12)
+
+
+def test_boilerplate_key_keeps_other_numbers():
+    key = ChunkDeduplicator._boilerplate_key
+    assert key("Table 3: results", 0) != key("Table 5: results", 1)
+    assert key("Figure 2", 0) != key("Figure 5", 1)
+    assert key("Results 2023", 0) != key("Results 2023", 1)
+    assert key("arXiv 2501", 0) != key("arXiv 2502", 5)
+
+
+def test_strip_page_boilerplate_removes_running_header_and_page_numbers():
+    deduplicator = ChunkDeduplicator()
+    pages = make_pages()
+    cleaned = deduplicator.strip_page_boilerplate(pages)
+
+    assert len(cleaned) == len(pages)
+    for i, page in enumerate(cleaned):
+        assert "Search-o1: Agentic Search-Enhanced" not in page
+        assert f"- {i + 1} -" not in page
+        assert f"Table {i * 3}: accuracy on benchmarks" in page
+        assert f"Figure {i * 2 + 5}" in page
+        assert "body line" in page
+    assert deduplicator.stats["boilerplate_lines_removed"] == 2 * len(pages)
+    assert deduplicator.stats["boilerplate_chars_removed"] == sum(
+        len("Search-o1: Agentic Search-Enhanced Large Reasoning Models") + len(f"- {i + 1} -")
+        for i in range(len(pages))
+    )
+
+
+def test_strip_page_boilerplate_keeps_short_documents():
+    deduplicator = ChunkDeduplicator()
+    pages = make_pages(2)
+    assert deduplicator.strip_page_boilerplate(pages) == pages
+
+
+def test_deduplicate_drops_near_copy_and_keeps_distinct_chunks():
+    deduplicator = ChunkDeduplicator(embedding_dim=4)
+    near_copy = BASE_CHUNK.replace("fetch", "retrieve")
+    distinct = "TransUNet merits both Transformers and U-Net as a strong alternative for medical image segmentation."
+    chunks = [BASE_CHUNK, near_copy, distinct, "   "]
+
+    retained, metadatas = deduplicator.deduplicate(chunks)
+
+    assert retained == [BASE_CHUNK, distinct]
+    assert [alias["text"] for alias in metadatas[0]["aliases"]] == [near_copy]
+    assert metadatas[0]["aliases"][0]["similarity"] >= deduplicator.threshold
+    assert metadatas[1]["aliases"] == []
+    assert deduplicator.stats["dropped_chunks"] == 2
+    assert deduplicator.stats["empty_chunks"] == 1
+    assert deduplicator.stats["vector_bytes_saved"] == 2 * 4 * 4
+
+
+def test_minhash_estimates_jaccard():
+    deduplicator = ChunkDeduplicator()
+    assert deduplicator.minhash(BASE_CHUNK) == deduplicator.minhash(BASE_CHUNK)
+    unrelated = "completely different text about medical image segmentation with convolutional networks"
+    assert deduplicator.similarity(deduplicator.minhash(BASE_CHUNK), deduplicator.minhash(unrelated)) < 0.2
+
+
+def test_stats_reset_per_run():
+    deduplicator = ChunkDeduplicator()
+    deduplicator.strip_page_boilerplate(make_pages())
+    deduplicator.deduplicate([BASE_CHUNK])
+    assert deduplicator.stats["embedding_chars_saved"] == deduplicator.stats["boilerplate_chars_removed"] > 0
+
+    deduplicator.deduplicate(["a b c"])
+    assert deduplicator.stats["boilerplate_chars_removed"] == 0
+    assert deduplicator.stats["embedding_chars_saved"] == 0
+    assert deduplicator.stats["estimated_embedding_tokens_saved"] == 0